@@ -0,0 +1,193 @@
+"""Per-track normalization hot path for fetch_spotify_data.
+
+Everything here is dependency-free, dict/string-only Python: the code
+that runs once per track across every playlist. Keeping it in its own
+module means the whole script can run unchanged under PyPy, or this one
+file can be Cython-compiled to an extension (the resulting .so shadows
+this .py on import) without touching the HTTP orchestration.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+MAJOR_LABEL_KEYWORDS = (
+    "sony",
+    "columbia",
+    "rca",
+    "arista",
+    "warner",
+    "atlantic",
+    "def jam",
+    "interscope",
+    "island",
+    "virgin",
+    "polydor",
+    "umg",
+    "universal",
+    "motown",
+    "republic",
+    "emi",
+    "capitol",
+)
+
+
+def classify_label(label: Optional[str]) -> str:
+    if not label:
+        return "Unknown"
+    normalized = label.lower().strip()
+    if not normalized:
+        return "Unknown"
+    for keyword in MAJOR_LABEL_KEYWORDS:
+        if keyword in normalized:
+            return "Major"
+    if "independent" in normalized or "self" in normalized:
+        return "Independent"
+    return "Independent"
+
+
+@lru_cache(maxsize=4096)
+def _join_artist_names(names: tuple) -> str:
+    # The same collab lineups repeat across playlists, so cache the joins.
+    return ", ".join(names) or "Unknown"
+
+
+@lru_cache(maxsize=4096)
+def _parse_release_year_cached(release_date: str) -> Optional[int]:
+    # Year-only dates ("2024") are common; handle them without the
+    # exception-driven fromisoformat fallback.
+    if len(release_date) == 4:
+        try:
+            return int(release_date)
+        except ValueError:
+            return None
+    try:
+        return datetime.fromisoformat(release_date[:10]).year
+    except ValueError:
+        try:
+            return int(release_date[:4])
+        except (TypeError, ValueError):
+            return None
+
+
+def parse_release_year(album: Optional[Dict]) -> Optional[int]:
+    if not album:
+        return None
+    release_date = album.get("release_date")
+    if not release_date:
+        return None
+    return _parse_release_year_cached(release_date)
+
+
+def build_track_payload(
+    track_item: Dict,
+    position: int,
+    feature: Optional[Dict],
+    artist_metadata: Dict[str, Dict],
+    artist_info: Optional[Dict],
+    missing_artists: Set[str],
+    release_year: Optional[int] = None,
+) -> Optional[Dict]:
+    track = track_item.get("track")
+    if not track or track.get("is_local"):
+        return None
+
+    # Bind repeated lookups to locals; this runs once per track across
+    # every playlist, so attribute/chain overhead adds up.
+    track_get = track.get
+    track_id = track_get("id")
+    if not track_id:
+        return None
+
+    artists = track_get("artists") or ()
+    artist_names = _join_artist_names(
+        tuple([artist.get("name") or "Unknown" for artist in artists])
+    )
+    first_artist = artists[0] if artists else None
+    primary_artist = first_artist.get("name") if first_artist else None
+    primary_artist_id = first_artist.get("id") if first_artist else None
+    metadata = artist_metadata.get(primary_artist.casefold()) if primary_artist else None
+    if not metadata and primary_artist:
+        missing_artists.add(primary_artist)
+
+    album = track_get("album") or {}
+    album_label = album.get("label")
+
+    features_block = None
+    if feature:
+        feature_get = feature.get
+        features_block = {
+            "danceability": feature_get("danceability"),
+            "energy": feature_get("energy"),
+            "valence": feature_get("valence"),
+            "tempo": feature_get("tempo"),
+            "acousticness": feature_get("acousticness"),
+        }
+
+    return {
+        "id": track_id,
+        "title": track_get("name", "Unknown"),
+        "artist": artist_names,
+        "artistCountry": metadata.get("artistCountry") if metadata else "Unknown",
+        "regionGroup": metadata.get("regionGroup") if metadata else "Unknown",
+        "diaspora": metadata.get("diaspora") if metadata else False,
+        "releaseYear": release_year,
+        "trackPopularity": track_get("popularity"),
+        "artistPopularity": (artist_info.get("popularity") if artist_info else None),
+        "artistGenres": artist_info.get("genres") if artist_info else [],
+        "artistId": primary_artist_id,
+        "playlistPosition": position,
+        "albumLabel": album_label or "Unknown",
+        "labelType": classify_label(album_label),
+        "albumReleaseDate": album.get("release_date"),
+        "addedAt": track_item.get("added_at"),
+        "features": features_block,
+    }
+
+
+def normalize_playlist(
+    playlist_id: str,
+    config: Dict,
+    snapshot: Dict,
+    track_items: List[Dict],
+    audio_features: Dict[str, Dict],
+    artist_metadata: Dict[str, Dict],
+    artist_details: Dict[str, Dict],
+    missing_artists: Set[str],
+) -> Dict:
+    tracks_payload: List[Dict] = []
+    launch_year = None
+    for position, item in enumerate(track_items, start=1):
+        track_block = item.get("track", {})
+        track_id = track_block.get("id")
+        artists = track_block.get("artists", [])
+        primary_artist_id = artists[0].get("id") if artists else None
+        artist_info = artist_details.get(primary_artist_id) if primary_artist_id else None
+        release_year = parse_release_year(track_block.get("album"))
+        launch_year = launch_year or release_year
+        payload = build_track_payload(
+            item,
+            position,
+            audio_features.get(track_id),
+            artist_metadata,
+            artist_info,
+            missing_artists,
+            release_year=release_year,
+        )
+        if payload:
+            tracks_payload.append(payload)
+
+    playlist_owner = snapshot.get("owner", {})
+    followers = snapshot.get("followers", {}).get("total")
+
+    return {
+        "id": playlist_id,
+        "name": snapshot.get("name", config.get("label", playlist_id)),
+        "curatorType": config.get("curatorType", "Unknown"),
+        "curator": playlist_owner.get("display_name") or playlist_owner.get("id") or "Unknown",
+        "followerCount": followers,
+        "launchYear": launch_year,
+        "description": snapshot.get("description"),
+        "tracks": tracks_payload,
+    }
@@ -7,165 +7,195 @@ Usage (PowerShell example):
     #    Consider keeping them in a .env file next to this script.
     # 2. Populate data/playlist_config.json with the playlists you want to analyse.
     # 3. Maintain artist details in data/artist_metadata.csv (artistCountry, regionGroup, diaspora).
-    # 4. If requests isn't installed yet, run:  python -m pip install requests
+    # 4. Install dependencies if needed:  python -m pip install -r requirements.txt
     # 5. Execute the script from the repository root:
     #      python scripts/fetch_spotify_data.py
     # 6. Outputs are written to:
-    #      data/raw/<slug>.json
+    #      data/raw/<slug>.jsonl
     #      data/processed/afrobeats_playlists.json
     #      data/scripts/data.js (for the dashboard)
 """
 from __future__ import annotations
 
+import argparse
 import base64
+import io
 import json
 import os
-from csv import DictReader
-from datetime import datetime
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from csv import reader
+from datetime import datetime, timedelta, timezone
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Set
 
+import ijson
+import orjson
 import requests
+import requests_cache
+from dotenv import dotenv_values
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from _fastpath import build_track_payload, classify_label, normalize_playlist, parse_release_year
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
+REPO_ROOT_STR = str(REPO_ROOT) + os.sep
 ENV_FILE = REPO_ROOT / ".env"
 OUTPUT_FILE = REPO_ROOT / "data" / "scripts" / "data.js"
 PLAYLIST_CONFIG_FILE = REPO_ROOT / "data" / "playlist_config.json"
 RAW_DATA_DIR = REPO_ROOT / "data" / "raw"
 PROCESSED_DATA_FILE = REPO_ROOT / "data" / "processed" / "afrobeats_playlists.json"
 ARTIST_METADATA_FILE = REPO_ROOT / "data" / "data" / "artist_metadata.csv"
-MAJOR_LABEL_KEYWORDS = (
-    "sony",
-    "columbia",
-    "rca",
-    "arista",
-    "warner",
-    "atlantic",
-    "def jam",
-    "interscope",
-    "island",
-    "virgin",
-    "polydor",
-    "umg",
-    "universal",
-    "motown",
-    "republic",
-    "emi",
-    "capitol",
+AUDIO_FEATURES_CACHE_FILE = REPO_ROOT / "data" / "cache" / "audio_features.json"
+
+# Shared HTTP session so sequential calls to accounts.spotify.com /
+# api.spotify.com reuse pooled connections instead of paying a fresh
+# TCP + TLS handshake per request. The sqlite-backed cache honours
+# ETags/Cache-Control, so reruns short-circuit unchanged playlist pages
+# to conditional 304s; token POSTs stay uncached via allowable_methods.
+_SESSION = requests_cache.CachedSession(
+    str(REPO_ROOT / "data" / "cache" / "http"),
+    backend="sqlite",
+    expire_after=timedelta(hours=6),
+    cache_control=True,
+    allowable_methods=("GET",),
+)
+# Retries back off exponentially and honour Spotify's Retry-After header
+# on 429s, so throttled calls wait and succeed instead of failing fast.
+# raise_on_status=False hands exhausted retries back as a normal response,
+# letting raise_for_status() raise the HTTPError our handlers catch rather
+# than urllib3 surfacing an uncatchable-at-those-sites RetryError.
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=6,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        ),
+    ),
 )
 
 
-def classify_label(label: Optional[str]) -> str:
-    if not label:
-        return "Unknown"
-    normalized = label.lower().strip()
-    if not normalized:
-        return "Unknown"
-    for keyword in MAJOR_LABEL_KEYWORDS:
-        if keyword in normalized:
-            return "Major"
-    if "independent" in normalized or "self" in normalized:
-        return "Independent"
-    return "Independent"
+def get_session() -> requests.Session:
+    """Return the module-level session (exposed for test customization)."""
+    return _SESSION
+
+
+def _parse(response: requests.Response) -> Dict:
+    """Decode a response body with orjson (much faster than Response.json)."""
+    return orjson.loads(response.content)
+
 
 # Update this structure with the playlists you want to analyse.
-# Keys become the playlist ids in the dashboard output.
-_DEFAULT_PLAYLIST_CONFIG = {
-    "afrobeats-hits": {
-        "id": "25Y75ozl2aI0NylFToefO5",
-        "curatorType": "Independent Curator",
-        "label": "Afrobeats Hits",
-    },
-    "afrobeats-2026": {
-        "id": "5myeBzohhCVewaK2Thqmo5",
-        "curatorType": "Independent Curator",
-        "label": "Afrobeats 2026",
-    },
-    "ginja": {
-        "id": "4XtoXt98uSrnUbMz7JtWZk",
-        "curatorType": "User-Generated",
-        "label": "Ginja",
-    },
-    "viral-afrobeats": {
-        "id": "6ebiO5veMmbIWL5aGvalgQ",
-        "curatorType": "Media Publisher",
-        "label": "Viral Afrobeats",
-    },
-    "top-afrobeats-hits": {
-        "id": "0RChPss4CYl5LTfK0CRgOZ",
-        "curatorType": "Media Publisher",
-        "label": "Top Afrobeats Hits",
-    },
-    "afrobeats-gold": {
-        "id": "1UFBYLsMwB2q0EypxWdBLO",
-        "curatorType": "Independent Curator",
-        "label": "Afrobeats Gold",
-    },
-    "amapiano-2025": {
-        "id": "4Ymf8eaPQGT7HMTymoX82f",
-        "curatorType": "Independent Curator",
-        "label": "Amapiano 2025",
-    },
-    "top-picks-afrobeats": {
-        "id": "1ynsIf7ZgpEFxIvuDBlUcK",
-        "curatorType": "Media Publisher",
-        "label": "Top Picks: Afrobeats",
-    },
-    "afrobeats-hits-indie": {
-        "id": "2DfNaw9Z1nuddjI6NczTXS",
-        "curatorType": "Independent Curator",
-        "label": "Afrobeats Hits (Indie)",
-    },
-}
-
-_DEFAULT_ARTIST_METADATA = {
-    "Rema": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Ayra Starr": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Burna Boy": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Wizkid": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Davido": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Tems": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Omah Lay": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "CKay": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Lojay": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Fireboy DML": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Joeboy": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Oxlade": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Tyla": {"artistCountry": "South Africa", "regionGroup": "Southern Africa", "diaspora": False},
-    "Rotimi": {"artistCountry": "United States", "regionGroup": "US Diaspora", "diaspora": True},
-    "Chris Brown": {"artistCountry": "United States", "regionGroup": "US Diaspora", "diaspora": True},
-    "Don Toliver": {"artistCountry": "United States", "regionGroup": "US Diaspora", "diaspora": True},
-    "Ed Sheeran": {"artistCountry": "United Kingdom", "regionGroup": "UK Collaborator", "diaspora": True},
-    "Sarz": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Victony": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Mack H.D": {"artistCountry": "Canada", "regionGroup": "Diaspora Collective", "diaspora": True},
-    "Black Sherif": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
-    "King Promise": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
-    "Amaarae": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": True},
-    "Stonebwoy": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
-    "Kuami Eugene": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
-    "Lasmid": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
-    "Shatta Wale": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
-    "Teni": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Tiwa Savage": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Kizz Daniel": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Mr Eazi": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-    "Yemi Alade": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
-}
+# Keys become the playlist ids in the dashboard output. Both defaults sit
+# behind cached factories so the dict allocations only happen on the
+# fallback path when no on-disk config/CSV overrides them.
+@cache
+def _default_playlist_config() -> Mapping[str, Dict]:
+    return MappingProxyType({
+        "afrobeats-hits": {
+            "id": "25Y75ozl2aI0NylFToefO5",
+            "curatorType": "Independent Curator",
+            "label": "Afrobeats Hits",
+        },
+        "afrobeats-2026": {
+            "id": "5myeBzohhCVewaK2Thqmo5",
+            "curatorType": "Independent Curator",
+            "label": "Afrobeats 2026",
+        },
+        "ginja": {
+            "id": "4XtoXt98uSrnUbMz7JtWZk",
+            "curatorType": "User-Generated",
+            "label": "Ginja",
+        },
+        "viral-afrobeats": {
+            "id": "6ebiO5veMmbIWL5aGvalgQ",
+            "curatorType": "Media Publisher",
+            "label": "Viral Afrobeats",
+        },
+        "top-afrobeats-hits": {
+            "id": "0RChPss4CYl5LTfK0CRgOZ",
+            "curatorType": "Media Publisher",
+            "label": "Top Afrobeats Hits",
+        },
+        "afrobeats-gold": {
+            "id": "1UFBYLsMwB2q0EypxWdBLO",
+            "curatorType": "Independent Curator",
+            "label": "Afrobeats Gold",
+        },
+        "amapiano-2025": {
+            "id": "4Ymf8eaPQGT7HMTymoX82f",
+            "curatorType": "Independent Curator",
+            "label": "Amapiano 2025",
+        },
+        "top-picks-afrobeats": {
+            "id": "1ynsIf7ZgpEFxIvuDBlUcK",
+            "curatorType": "Media Publisher",
+            "label": "Top Picks: Afrobeats",
+        },
+        "afrobeats-hits-indie": {
+            "id": "2DfNaw9Z1nuddjI6NczTXS",
+            "curatorType": "Independent Curator",
+            "label": "Afrobeats Hits (Indie)",
+        },
+    })
+
+
+@cache
+def _default_artist_metadata() -> Mapping[str, Dict]:
+    return MappingProxyType({
+        "Rema": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Ayra Starr": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Burna Boy": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Wizkid": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Davido": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Tems": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Omah Lay": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "CKay": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Lojay": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Fireboy DML": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Joeboy": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Oxlade": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Tyla": {"artistCountry": "South Africa", "regionGroup": "Southern Africa", "diaspora": False},
+        "Rotimi": {"artistCountry": "United States", "regionGroup": "US Diaspora", "diaspora": True},
+        "Chris Brown": {"artistCountry": "United States", "regionGroup": "US Diaspora", "diaspora": True},
+        "Don Toliver": {"artistCountry": "United States", "regionGroup": "US Diaspora", "diaspora": True},
+        "Ed Sheeran": {"artistCountry": "United Kingdom", "regionGroup": "UK Collaborator", "diaspora": True},
+        "Sarz": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Victony": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Mack H.D": {"artistCountry": "Canada", "regionGroup": "Diaspora Collective", "diaspora": True},
+        "Black Sherif": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
+        "King Promise": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
+        "Amaarae": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": True},
+        "Stonebwoy": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
+        "Kuami Eugene": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
+        "Lasmid": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
+        "Shatta Wale": {"artistCountry": "Ghana", "regionGroup": "Ghana", "diaspora": False},
+        "Teni": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Tiwa Savage": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Kizz Daniel": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Mr Eazi": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+        "Yemi Alade": {"artistCountry": "Nigeria", "regionGroup": "Nigeria", "diaspora": False},
+    })
 
 def load_env_file(path: Path) -> None:
-    """Populate os.environ with variables from a simple KEY=VALUE .env file."""
+    """Populate os.environ with variables from a KEY=VALUE .env file."""
     if not path.exists():
         return
 
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, value = line.split("=", 1)
-        key = key.strip()
-        value = value.strip().strip('"')
-        os.environ.setdefault(key, value)
+    # dotenv handles quoting, export prefixes, and values containing "="
+    # that the old hand-rolled line splitter silently mangled.
+    for key, value in dotenv_values(path).items():
+        os.environ.setdefault(key, value or "")
 
 
 def build_basic_auth_header(client_id: str, client_secret: str) -> str:
@@ -174,65 +204,101 @@ def build_basic_auth_header(client_id: str, client_secret: str) -> str:
 
 
 def get_access_token(client_id: str, client_secret: str) -> str:
-    response = requests.post(
+    response = _SESSION.post(
         "https://accounts.spotify.com/api/token",
         data={"grant_type": "client_credentials"},
         headers={"Authorization": build_basic_auth_header(client_id, client_secret)},
         timeout=15,
     )
     response.raise_for_status()
-    payload = response.json()
+    payload = _parse(response)
     return payload["access_token"]
 
 
-def fetch_playlist_snapshot(playlist_id: str, token: str, market: Optional[str] = None) -> Dict:
+# Only request the fields the normalizer actually reads; the default
+# responses carry album art, markets, and external ids we never touch.
+_TRACK_ITEM_FIELDS = (
+    "added_at,track(id,name,is_local,popularity,album(release_date,label),artists(id,name))"
+)
+_TRACKS_PAGE_FIELDS = f"next,limit,items({_TRACK_ITEM_FIELDS})"
+_PLAYLIST_FIELDS = (
+    "id,name,description,snapshot_id,owner(id,display_name),followers(total),"
+    f"tracks({_TRACKS_PAGE_FIELDS})"
+)
+
+
+def fetch_playlist_snapshot(playlist_id: str, market: Optional[str] = None) -> Dict:
     """Fetch playlist metadata plus the first page of tracks."""
-    params = {"market": market} if market else None
-    response = requests.get(
+    params = {"fields": _PLAYLIST_FIELDS}
+    if market:
+        params["market"] = market
+    response = _SESSION.get(
         f"https://api.spotify.com/v1/playlists/{playlist_id}",
-        headers={"Authorization": f"Bearer {token}"},
         params=params,
         timeout=20,
     )
     response.raise_for_status()
-    return response.json()
+    return _parse(response)
 
 
-def fetch_all_playlist_tracks(playlist: Dict, token: str) -> List[Dict]:
-    """Walk the paginated playlist tracks feed and collect all track entries."""
-    items: List[Dict] = []
+def iter_playlist_tracks(playlist: Dict, market: Optional[str] = None) -> Iterable[Dict]:
+    """Yield track entries one at a time across the paginated tracks feed.
+
+    Pages after the first are parsed incrementally with ijson so we never
+    materialize a whole page dict; pagination runs on explicit offsets
+    (a page shorter than the limit means we are done) because parsing
+    only the items leaves no `next` cursor to follow.
+    """
     tracks_block = playlist.get("tracks", {})
-    next_url = tracks_block.get("next")
-    items.extend(tracks_block.get("items", []))
+    first_items = tracks_block.get("items", [])
+    yield from first_items
+    if not tracks_block.get("next"):
+        return
 
-    while next_url:
-        response = requests.get(next_url, headers={"Authorization": f"Bearer {token}"}, timeout=20)
+    page_limit = 100
+    offset = len(first_items)
+    url = f"https://api.spotify.com/v1/playlists/{playlist['id']}/tracks"
+    while True:
+        params = {"limit": page_limit, "offset": offset, "fields": _TRACKS_PAGE_FIELDS}
+        if market:
+            params["market"] = market
+        response = _SESSION.get(url, params=params, timeout=20)
         response.raise_for_status()
-        page = response.json()
-        next_url = page.get("next")
-        items.extend(page.get("items", []))
+        # No socket streaming here: CachedSession buffers the whole body
+        # when storing a response anyway, and both its replayed raw stream
+        # and its post-save reset of a live gzipped raw stream break
+        # ijson's reads. Parsing the buffered bytes item-by-item keeps the
+        # memory win of never building the page's dict tree.
+        count = 0
+        for item in ijson.items(io.BytesIO(response.content), "items.item"):
+            count += 1
+            yield item
+        if count < page_limit:
+            return
+        offset += count
+
+
+def fetch_all_playlist_tracks(playlist: Dict, market: Optional[str] = None) -> List[Dict]:
+    """Walk the paginated playlist tracks feed and collect all track entries."""
+    return list(iter_playlist_tracks(playlist, market=market))
+
 
-    return items
+_VERBOSE = False
 
 
-def chunked(iterable: Iterable[str], size: int) -> Iterable[List[str]]:
-    chunk: List[str] = []
-    for item in iterable:
-        chunk.append(item)
-        if len(chunk) >= size:
-            yield chunk
-            chunk = []
-    if chunk:
-        yield chunk
+def _vprint(*args, **kwargs) -> None:
+    """Per-playlist progress logging, enabled with --verbose."""
+    if _VERBOSE:
+        print(*args, **kwargs)
 
 
 def utc_timestamp() -> str:
-    return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
 
 def load_playlist_config(path: Path) -> Dict[str, Dict]:
     if not path.exists():
-        return dict(_DEFAULT_PLAYLIST_CONFIG)
+        return dict(_default_playlist_config())
 
     try:
         payload = json.loads(path.read_text(encoding="utf-8"))
@@ -249,66 +315,125 @@ def load_playlist_config(path: Path) -> Dict[str, Dict]:
     return config
 
 
-def load_artist_metadata(path: Path) -> Dict[str, Dict]:
-    if not path.exists():
-        return dict(_DEFAULT_ARTIST_METADATA)
+_TRUE_VALUES = frozenset({"true", "1", "yes", "y"})
+
+
+def _casefold_index(metadata: Mapping[str, Dict]) -> Dict[str, Dict]:
+    """Key artist metadata by casefolded name so lookups tolerate casing drift."""
+    return {name.casefold(): meta for name, meta in metadata.items()}
 
-    with path.open(encoding="utf-8") as handle:
-        reader = DictReader(handle)
+
+@lru_cache(maxsize=1)
+def _load_artist_metadata_cached(path_str: str, mtime_ns: int) -> Dict[str, Dict]:
+    """Parse the artist CSV once per (path, mtime); reruns hit the cache."""
+    with open(path_str, encoding="utf-8", newline="") as handle:
+        rows = reader(handle)
+        header = next(rows, [])
         required_columns = {"artist", "artistCountry", "regionGroup", "diaspora"}
-        if not required_columns.issubset(reader.fieldnames or []):
-            missing = required_columns - set(reader.fieldnames or [])
+        if not required_columns.issubset(header):
+            missing = required_columns - set(header)
             raise SystemExit(
                 f"Artist metadata file is missing required columns: {', '.join(sorted(missing))}."
             )
 
-        metadata: Dict[str, Dict] = {}
-        for row in reader:
-            artist_name = (row.get("artist") or "").strip()
-            if not artist_name:
-                continue
-            diaspora_value = (row.get("diaspora") or "").strip().lower()
-            metadata[artist_name] = {
-                "artistCountry": (row.get("artistCountry") or "Unknown").strip() or "Unknown",
-                "regionGroup": (row.get("regionGroup") or "Unknown").strip() or "Unknown",
-                "diaspora": diaspora_value in {"true", "1", "yes", "y"},
+        idx_artist = header.index("artist")
+        idx_country = header.index("artistCountry")
+        idx_region = header.index("regionGroup")
+        idx_diaspora = header.index("diaspora")
+        max_idx = max(idx_artist, idx_country, idx_region, idx_diaspora)
+
+        return _casefold_index(
+            {
+                row[idx_artist].strip(): {
+                    "artistCountry": row[idx_country].strip() or "Unknown",
+                    "regionGroup": row[idx_region].strip() or "Unknown",
+                    "diaspora": row[idx_diaspora].strip().lower() in _TRUE_VALUES,
+                }
+                for row in rows
+                if len(row) > max_idx and row[idx_artist].strip()
             }
+        )
+
 
-    return metadata or dict(_DEFAULT_ARTIST_METADATA)
+def load_artist_metadata(path: Path) -> Dict[str, Dict]:
+    """Load artist metadata keyed by casefolded artist name."""
+    if not path.exists():
+        return _casefold_index(_default_artist_metadata())
 
+    metadata = _load_artist_metadata_cached(str(path), path.stat().st_mtime_ns)
+    return metadata or _casefold_index(_default_artist_metadata())
 
-def fetch_audio_features(track_ids: List[str], token: str) -> Dict[str, Dict]:
+
+def fetch_audio_features(track_ids: List[str]) -> Dict[str, Dict]:
     features: Dict[str, Dict] = {}
-    for batch in chunked(track_ids, 100):
+    # Precompute the joined id params so the string work is separable from
+    # the HTTP latency when batches run concurrently.
+    id_params = [",".join(track_ids[i : i + 100]) for i in range(0, len(track_ids), 100)]
+    for ids_param in id_params:
         try:
-            response = requests.get(
+            response = _SESSION.get(
                 "https://api.spotify.com/v1/audio-features",
-                params={"ids": ",".join(batch)},
-                headers={"Authorization": f"Bearer {token}"},
+                params={"ids": ids_param},
                 timeout=20,
             )
             response.raise_for_status()
         except requests.HTTPError as error:
+            # Only reached once the adapter's retries are exhausted.
             print(
-                "Warning: audio-features request failed",
+                "Warning: audio-features request failed after retries",
                 getattr(error.response, "status_code", "?"),
                 getattr(error.response, "text", ""),
             )
             continue
-        for entry in response.json().get("audio_features", []) or []:
+        for entry in _parse(response).get("audio_features", []) or []:
             if entry and entry.get("id"):
                 features[entry["id"]] = entry
     return features
 
 
-def fetch_artist_details(artist_ids: List[str], token: str) -> Dict[str, Dict]:
+def fetch_audio_features_bulk(track_ids: Set[str]) -> Dict[str, Dict]:
+    """Fetch audio features for all track ids at once, deduplicated across playlists.
+
+    Features for a track id never change, so previously fetched entries are
+    reused from an on-disk cache and only the remainder is requested, with
+    the 100-id batches fanned out concurrently on the session pool.
+    """
+    features: Dict[str, Dict] = {}
+    if AUDIO_FEATURES_CACHE_FILE.exists():
+        try:
+            features = orjson.loads(AUDIO_FEATURES_CACHE_FILE.read_bytes())
+        except orjson.JSONDecodeError:
+            # A run killed mid-write can leave a truncated cache; start
+            # fresh rather than crashing every subsequent run.
+            print("Warning: audio-features cache is corrupt; refetching.")
+            features = {}
+
+    pending = sorted(track_id for track_id in track_ids if track_id not in features)
+    if pending:
+        batches = [pending[i : i + 100] for i in range(0, len(pending), 100)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for batch_features in executor.map(
+                fetch_audio_features, batches
+            ):
+                features.update(batch_features)
+        AUDIO_FEATURES_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # Write via temp file + rename so an interrupted run never leaves
+        # a truncated cache behind.
+        tmp_file = AUDIO_FEATURES_CACHE_FILE.with_suffix(".json.tmp")
+        tmp_file.write_bytes(orjson.dumps(features))
+        os.replace(tmp_file, AUDIO_FEATURES_CACHE_FILE)
+
+    return features
+
+
+def fetch_artist_details(artist_ids: List[str]) -> Dict[str, Dict]:
     details: Dict[str, Dict] = {}
-    for batch in chunked(artist_ids, 50):
+    id_params = [",".join(artist_ids[i : i + 50]) for i in range(0, len(artist_ids), 50)]
+    for ids_param in id_params:
         try:
-            response = requests.get(
+            response = _SESSION.get(
                 "https://api.spotify.com/v1/artists",
-                params={"ids": ",".join(batch)},
-                headers={"Authorization": f"Bearer {token}"},
+                params={"ids": ids_param},
                 timeout=20,
             )
             response.raise_for_status()
@@ -319,135 +444,63 @@ def fetch_artist_details(artist_ids: List[str], token: str) -> Dict[str, Dict]:
                 getattr(error.response, "text", ""),
             )
             continue
-        for entry in response.json().get("artists", []) or []:
+        for entry in _parse(response).get("artists", []) or []:
             if entry and entry.get("id"):
                 details[entry["id"]] = entry
     return details
 
 
-def parse_release_year(album: Optional[Dict]) -> Optional[int]:
-    if not album:
-        return None
-    release_date = album.get("release_date")
-    if not release_date:
-        return None
+def _primary_artist_ids(track_items: List[Dict]) -> List[str]:
+    artist_ids = []
+    for item in track_items:
+        track_block = item.get("track") or {}
+        artists = track_block.get("artists") or []
+        if artists:
+            artist_id = artists[0].get("id")
+            if artist_id:
+                artist_ids.append(artist_id)
+    return artist_ids
+
+
+def _fetch_playlist(slug: str, cfg: Dict) -> Dict:
+    """Fetch one playlist's snapshot and full track list.
+
+    Returns a result dict with "snapshot"/"trackItems", or a "skipped"
+    entry when the snapshot request failed. Runs on a worker thread; the
+    shared session's connection pool handles concurrency.
+    """
+    _vprint(f"Fetching playlist {slug} ({cfg['id']})...", flush=True)
+    market = cfg.get("market")
     try:
-        return datetime.fromisoformat(release_date[:10]).year
-    except ValueError:
-        try:
-            return int(release_date[:4])
-        except (TypeError, ValueError):
-            return None
-
-
-def build_track_payload(
-    track_item: Dict,
-    position: int,
-    feature: Optional[Dict],
-    artist_metadata: Dict[str, Dict],
-    artist_info: Optional[Dict],
-    missing_artists: Set[str],
-) -> Optional[Dict]:
-    track = track_item.get("track")
-    if not track or track.get("is_local"):
-        return None
-
-    track_id = track.get("id")
-    if not track_id:
-        return None
-
-    artists = track.get("artists", [])
-    artist_names = ", ".join(artist.get("name", "Unknown") for artist in artists) or "Unknown"
-    primary_artist = artists[0].get("name") if artists else None
-    primary_artist_id = artists[0].get("id") if artists else None
-    metadata = artist_metadata.get(primary_artist or "") if primary_artist else None
-    if not metadata and primary_artist:
-        missing_artists.add(primary_artist)
-
-    album = track.get("album") or {}
-
-    features_block = None
-    if feature:
-        features_block = {
-            "danceability": feature.get("danceability"),
-            "energy": feature.get("energy"),
-            "valence": feature.get("valence"),
-            "tempo": feature.get("tempo"),
-            "acousticness": feature.get("acousticness"),
+        snapshot = fetch_playlist_snapshot(cfg["id"], market=market)
+    except requests.HTTPError as error:
+        status_code = getattr(error.response, "status_code", "?")
+        message = getattr(error.response, "text", "") or getattr(error.response, "reason", "")
+        print(f"  ! Failed to fetch playlist {slug} (status {status_code}). Skipping.")
+        return {
+            "slug": slug,
+            "skipped": {
+                "playlistId": cfg["id"],
+                "status": str(status_code),
+                "message": (message or "")[:200],
+            },
         }
 
-    return {
-        "id": track_id,
-        "title": track.get("name", "Unknown"),
-        "artist": artist_names,
-        "artistCountry": metadata.get("artistCountry") if metadata else "Unknown",
-        "regionGroup": metadata.get("regionGroup") if metadata else "Unknown",
-        "diaspora": metadata.get("diaspora") if metadata else False,
-        "releaseYear": parse_release_year(track.get("album")),
-        "trackPopularity": track.get("popularity"),
-        "artistPopularity": (artist_info.get("popularity") if artist_info else None),
-        "artistGenres": artist_info.get("genres") if artist_info else [],
-        "artistId": primary_artist_id,
-        "playlistPosition": position,
-        "albumLabel": album.get("label") or "Unknown",
-        "labelType": classify_label(album.get("label")),
-        "albumReleaseDate": album.get("release_date"),
-        "addedAt": track_item.get("added_at"),
-        "features": features_block,
-    }
-
-
-def normalize_playlist(
-    playlist_id: str,
-    config: Dict,
-    snapshot: Dict,
-    track_items: List[Dict],
-    audio_features: Dict[str, Dict],
-    artist_metadata: Dict[str, Dict],
-    artist_details: Dict[str, Dict],
-    missing_artists: Set[str],
-) -> Dict:
-    tracks_payload: List[Dict] = []
-    for position, item in enumerate(track_items, start=1):
-        track_block = item.get("track", {})
-        track_id = track_block.get("id")
-        artists = track_block.get("artists", [])
-        primary_artist_id = artists[0].get("id") if artists else None
-        artist_info = artist_details.get(primary_artist_id) if primary_artist_id else None
-        payload = build_track_payload(
-            item,
-            position,
-            audio_features.get(track_id),
-            artist_metadata,
-            artist_info,
-            missing_artists,
-        )
-        if payload:
-            tracks_payload.append(payload)
-
-    playlist_owner = snapshot.get("owner", {})
-    followers = snapshot.get("followers", {}).get("total")
-
-    launch_year = None
-    for item in track_items:
-        first_year = parse_release_year(item.get("track", {}).get("album"))
-        if first_year:
-            launch_year = first_year
-            break
-
-    return {
-        "id": playlist_id,
-        "name": snapshot.get("name", config.get("label", playlist_id)),
-        "curatorType": config.get("curatorType", "Unknown"),
-        "curator": playlist_owner.get("display_name") or playlist_owner.get("id") or "Unknown",
-        "followerCount": followers,
-        "launchYear": launch_year,
-        "description": snapshot.get("description"),
-        "tracks": tracks_payload,
-    }
+    track_items = fetch_all_playlist_tracks(snapshot, market=market)
+    return {"slug": slug, "snapshot": snapshot, "trackItems": track_items}
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print per-playlist fetch and write progress.",
+    )
+    args = parser.parse_args()
+    global _VERBOSE
+    _VERBOSE = args.verbose
+
     load_env_file(ENV_FILE)
 
     client_id = os.environ.get("SPOTIFY_CLIENT_ID")
@@ -459,6 +512,7 @@ def main() -> None:
     artist_metadata = load_artist_metadata(ARTIST_METADATA_FILE)
 
     access_token = get_access_token(client_id, client_secret)
+    _SESSION.headers["Authorization"] = f"Bearer {access_token}"
 
     RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
     PROCESSED_DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -468,42 +522,73 @@ def main() -> None:
     playlists_payload: List[Dict] = []
     missing_artists: Set[str] = set()
     skipped_playlists: Dict[str, Dict[str, Optional[str]]] = {}
-    artist_details_cache: Dict[str, Dict] = {}
     for slug, cfg in playlist_config.items():
         if "id" not in cfg:
             raise SystemExit(f"Playlist config for '{slug}' is missing an 'id'.")
-        print(f"Fetching playlist {slug} ({cfg['id']})...", flush=True)
-        market = cfg.get("market")
-        try:
-            snapshot = fetch_playlist_snapshot(cfg["id"], access_token, market=market)
-        except requests.HTTPError as error:
-            status_code = getattr(error.response, "status_code", "?")
-            message = getattr(error.response, "text", "") or getattr(error.response, "reason", "")
-            print(f"  ! Failed to fetch playlist (status {status_code}). Skipping.")
-            skipped_playlists[slug] = {
-                "playlistId": cfg["id"],
-                "status": str(status_code),
-                "message": (message or "")[:200],
-            }
-            continue
-        track_items = fetch_all_playlist_tracks(snapshot, access_token)
-        track_ids = [item.get("track", {}).get("id") for item in track_items if item.get("track")]
-        track_ids = [track_id for track_id in track_ids if track_id]
 
-        audio_features = fetch_audio_features(track_ids, access_token) if track_ids else {}
-
-        primary_artist_ids = []
-        for item in track_items:
+    # Fetch playlists concurrently on the shared session's connection pool;
+    # writes stay on the main thread so output ordering is deterministic.
+    results: Dict[str, Dict] = {}
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        futures = [
+            executor.submit(_fetch_playlist, slug, cfg)
+            for slug, cfg in playlist_config.items()
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["slug"]] = result
+
+    # Enrich once across all playlists: popular tracks and artists recur
+    # between playlists, so deduplicating ids first avoids refetching them.
+    all_track_ids: Set[str] = set()
+    all_artist_ids: Set[str] = set()
+    for result in results.values():
+        if "skipped" in result:
+            continue
+        for item in result["trackItems"]:
             track_block = item.get("track") or {}
-            artists = track_block.get("artists") or []
-            if artists:
-                artist_id = artists[0].get("id")
-                if artist_id:
-                    primary_artist_ids.append(artist_id)
+            track_id = track_block.get("id")
+            if track_id:
+                all_track_ids.add(track_id)
+        all_artist_ids.update(_primary_artist_ids(result["trackItems"]))
+
+    audio_features = fetch_audio_features_bulk(all_track_ids) if all_track_ids else {}
+    artist_details_cache = (
+        fetch_artist_details(sorted(all_artist_ids)) if all_artist_ids else {}
+    )
 
-        new_artist_ids = [artist_id for artist_id in set(primary_artist_ids) if artist_id not in artist_details_cache]
-        if new_artist_ids:
-            artist_details_cache.update(fetch_artist_details(new_artist_ids, access_token))
+    def _write_raw(raw_file: Path, raw_payload: Dict) -> None:
+        # JSON Lines layout: header record, one line per track item, then a
+        # closing audioFeatures record, so downstream tooling can stream the
+        # file without loading it whole.
+        header = {
+            key: raw_payload[key]
+            for key in ("slug", "playlistId", "fetchedAt", "config", "snapshot",
+                        "missingArtists", "artistDetails")
+        }
+        with raw_file.open("wb") as handle:
+            handle.write(orjson.dumps(header))
+            handle.write(b"\n")
+            for item in raw_payload["trackItems"]:
+                handle.write(orjson.dumps(item))
+                handle.write(b"\n")
+            handle.write(orjson.dumps({"audioFeatures": raw_payload["audioFeatures"]}))
+            handle.write(b"\n")
+        _vprint(f"  ↳ raw -> {str(raw_file).removeprefix(REPO_ROOT_STR)}")
+
+    # Raw dumps go through a small writer pool so disk I/O for one
+    # playlist overlaps with normalizing the next.
+    writer = ThreadPoolExecutor(max_workers=2)
+    raw_writes = []
+    for slug in playlist_config:
+        result = results[slug]
+        if "skipped" in result:
+            skipped_playlists[slug] = result["skipped"]
+            continue
+
+        snapshot = result["snapshot"]
+        track_items = result["trackItems"]
+        cfg = playlist_config[slug]
 
         missing_for_playlist: Set[str] = set()
         playlists_payload.append(
@@ -518,29 +603,35 @@ def main() -> None:
                 missing_for_playlist,
             )
         )
-        if missing_for_playlist:
-            missing_artists.update(missing_for_playlist)
+        missing_artists.update(missing_for_playlist)
 
+        playlist_artist_ids = set(_primary_artist_ids(track_items))
         artist_details_subset = {
-            artist_id: artist_details_cache.get(artist_id)
-            for artist_id in set(primary_artist_ids)
-            if artist_details_cache.get(artist_id)
+            artist_id: artist_details_cache[artist_id]
+            for artist_id in playlist_artist_ids
+            if artist_id in artist_details_cache
         }
 
         raw_payload = {
             "slug": slug,
             "playlistId": cfg["id"],
-            "fetchedAt": utc_timestamp(),
-            "config": dict(cfg),
+            "fetchedAt": run_started_at,
+            "config": cfg,
             "snapshot": snapshot,
             "trackItems": track_items,
-            "audioFeatures": audio_features,
+            "audioFeatures": {
+                track_id: audio_features[track_id]
+                for item in track_items
+                if (track_id := (item.get("track") or {}).get("id")) in audio_features
+            },
             "missingArtists": sorted(missing_for_playlist),
             "artistDetails": artist_details_subset,
         }
-        raw_file = RAW_DATA_DIR / f"{slug}.json"
-        raw_file.write_text(json.dumps(raw_payload, indent=2), encoding="utf-8")
-        print(f"  ↳ raw -> {raw_file.relative_to(REPO_ROOT)}")
+        raw_writes.append(writer.submit(_write_raw, RAW_DATA_DIR / f"{slug}.jsonl", raw_payload))
+
+    for write in raw_writes:
+        write.result()
+    writer.shutdown()
 
     run_completed_at = utc_timestamp()
     dataset = {
@@ -555,14 +646,19 @@ def main() -> None:
         },
     }
 
-    PROCESSED_DATA_FILE.write_text(json.dumps(dataset, indent=2), encoding="utf-8")
-    print(f"Wrote {PROCESSED_DATA_FILE.relative_to(REPO_ROOT)}")
-
-    OUTPUT_FILE.write_text(
-        "window.AFROBEATS_DATA = " + json.dumps(dataset, indent=2) + ";\n",
-        encoding="utf-8",
-    )
-    print(f"Wrote {OUTPUT_FILE.relative_to(REPO_ROOT)}")
+    # Encode once; both outputs share the same bytes.
+    encoded = orjson.dumps(dataset, option=orjson.OPT_INDENT_2)
+    PROCESSED_DATA_FILE.write_bytes(encoded)
+    print(f"Wrote {str(PROCESSED_DATA_FILE).removeprefix(REPO_ROOT_STR)}")
+
+    # data.js is just the processed JSON wrapped in a JS assignment; stream
+    # the bytes from disk so we never concatenate the multi-MB payload.
+    with OUTPUT_FILE.open("wb") as dst:
+        dst.write(b"window.AFROBEATS_DATA = ")
+        with PROCESSED_DATA_FILE.open("rb") as src:
+            shutil.copyfileobj(src, dst, length=1 << 20)
+        dst.write(b";\n")
+    print(f"Wrote {str(OUTPUT_FILE).removeprefix(REPO_ROOT_STR)}")
 
 
 if __name__ == "__main__":